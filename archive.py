@@ -0,0 +1,70 @@
+import threading
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, delete, literal, select
+
+
+class DischargeArchiver:
+    """Moves discharged patients and their tasks into monthly history tables.
+
+    History lives in ``<table>_history_YYYYMM`` tables created on first use,
+    so the live tables only ever hold waiting patients and whole months of
+    history can be dropped or exported independently. Each call archives a
+    batch with one INSERT ... SELECT per table followed by the deletes, all in
+    a single transaction.
+    """
+
+    def __init__(self, db, patients_table, tasks_table):
+        self.db = db
+        self.patients_table = patients_table
+        self.tasks_table = tasks_table
+        self.metadata = MetaData()
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def _history_table(self, source, suffix):
+        name = f'{source.name}_history_{suffix}'
+        table = self.metadata.tables.get(name)
+        if table is None:
+            # Live ids can be reused after a restart, so history gets its own key.
+            columns = [Column('history_id', Integer, primary_key=True)]
+            columns.extend(
+                Column(column.name, column.type, index=column.primary_key)
+                for column in source.columns
+            )
+            columns.append(Column('discharged_at', DateTime, nullable=False, index=True))
+            table = Table(name, self.metadata, *columns)
+        return table
+
+    def history_tables(self, when):
+        suffix = when.strftime('%Y%m')
+        with self._lock:
+            tables = self._tables.get(suffix)
+            if tables is None:
+                tables = (
+                    self._history_table(self.patients_table, suffix),
+                    self._history_table(self.tasks_table, suffix)
+                )
+                self.metadata.create_all(self.db.engine, tables=list(tables), checkfirst=True)
+                self._tables[suffix] = tables
+        return tables
+
+    def _copy(self, source, target, where, discharged_at):
+        names = [column.name for column in source.columns] + ['discharged_at']
+        query = select(*source.columns, literal(discharged_at, DateTime).label('discharged_at')).where(where)
+        return target.insert().from_select(names, query)
+
+    def archive(self, patient_ids, discharged_at=None):
+        """Archive and remove the given patients; returns how many were moved"""
+        if not patient_ids:
+            return 0
+        discharged_at = discharged_at or datetime.utcnow()
+        patients_history, tasks_history = self.history_tables(discharged_at)
+        patients, tasks = self.patients_table, self.tasks_table
+        session = self.db.session
+
+        session.execute(self._copy(tasks, tasks_history, tasks.c.patient_id.in_(patient_ids), discharged_at))
+        session.execute(self._copy(patients, patients_history, patients.c.id.in_(patient_ids), discharged_at))
+        session.execute(delete(tasks).where(tasks.c.patient_id.in_(patient_ids)))
+        result = session.execute(delete(patients).where(patients.c.id.in_(patient_ids)))
+        return result.rowcount
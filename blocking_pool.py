@@ -0,0 +1,51 @@
+import threading
+
+
+class BlockingPool:
+    """Runs blocking or CPU-bound calls without stalling the Socket.IO server.
+
+    Under eventlet the call is handed to eventlet's OS thread pool so the hub
+    keeps serving other connections; under gevent it goes to the hub's
+    thread pool; in threading mode it simply runs on the caller's thread.
+    At most ``max_workers`` calls run at once; callers beyond that block
+    cooperatively on a queue of free slots until one is handed back.
+    """
+
+    def __init__(self, socketio, max_workers=4):
+        self.socketio = socketio
+        self.max_workers = max_workers
+        self.active = 0
+        self.waiting = 0
+        self._slots = socketio.server.eio.create_queue()
+        for _ in range(max_workers):
+            self._slots.put(None)
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        with self._lock:
+            self.waiting += 1
+        try:
+            self._slots.get()
+        finally:
+            with self._lock:
+                self.waiting -= 1
+        with self._lock:
+            self.active += 1
+
+    def _release(self):
+        with self._lock:
+            self.active -= 1
+        self._slots.put(None)
+
+    def run(self, fn, *args, **kwargs):
+        self._acquire()
+        try:
+            if self.socketio.async_mode == 'eventlet':
+                from eventlet import tpool
+                return tpool.execute(fn, *args, **kwargs)
+            if self.socketio.async_mode == 'gevent':
+                from gevent import get_hub
+                return get_hub().threadpool.apply(fn, args, kwargs)
+            return fn(*args, **kwargs)
+        finally:
+            self._release()
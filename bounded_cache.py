@@ -0,0 +1,158 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from flask_caching.backends.base import BaseCache
+
+
+class LRUCache(BaseCache):
+    """In-process Flask-Caching backend with a hard size cap.
+
+    Entries are kept in recency order and the least recently used one is
+    evicted once ``threshold`` is reached. Timeouts are shortened by a random
+    fraction of up to ``jitter`` so entries written together do not all
+    expire together. Hits, misses, evictions and expirations are counted for
+    ``stats()``.
+    """
+
+    def __init__(self, threshold=500, default_timeout=300, jitter=0.1, ignore_errors=False):
+        super().__init__(default_timeout=default_timeout)
+        self.threshold = threshold
+        self.jitter = jitter
+        self.ignore_errors = ignore_errors
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.update(
+            threshold=config['CACHE_THRESHOLD'],
+            jitter=config.get('CACHE_TTL_JITTER', 0.1),
+            ignore_errors=config['CACHE_IGNORE_ERRORS']
+        )
+        return cls(*args, **kwargs)
+
+    def _expires_at(self, timeout):
+        timeout = self._normalize_timeout(timeout)
+        if timeout == 0:
+            return None
+        return time.monotonic() + timeout * (1 - random.random() * self.jitter)
+
+    def _live_entry(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, _ = entry
+        if expires_at is not None and expires_at <= now:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        return entry
+
+    def get(self, key):
+        with self._lock:
+            entry = self._live_entry(key, time.monotonic())
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            self._entries[key] = (self._expires_at(timeout), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.threshold:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return True
+
+    def add(self, key, value, timeout=None):
+        with self._lock:
+            if self._live_entry(key, time.monotonic()) is not None:
+                return False
+        return self.set(key, value, timeout)
+
+    def delete(self, key):
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def has(self, key):
+        with self._lock:
+            return self._live_entry(key, time.monotonic()) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        return True
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'threshold': self.threshold,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+class SingleFlight:
+    """Collapses concurrent recomputations of the same cache key into one.
+
+    The first caller to miss runs the loader and stores the result; callers
+    that miss while it is running wait for it and then read the cached value
+    instead of hitting the database themselves. ``None`` results are not
+    cached.
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.coalesced = 0
+
+    def get(self, key, loader, timeout=None):
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = [threading.Lock(), 0]
+            shared = flight[1] > 0
+            flight[1] += 1
+        try:
+            with flight[0]:
+                if shared:
+                    value = self.cache.get(key)
+                    if value is not None:
+                        with self._lock:
+                            self.coalesced += 1
+                        return value
+                value = loader()
+                with self._lock:
+                    self.loads += 1
+                if value is not None:
+                    self.cache.set(key, value, timeout=timeout)
+                return value
+        finally:
+            with self._lock:
+                flight[1] -= 1
+                if flight[1] == 0:
+                    self._flights.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {'loads': self.loads, 'coalesced': self.coalesced, 'in_flight': len(self._flights)}
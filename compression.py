@@ -0,0 +1,99 @@
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import g, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/javascript',
+    'application/javascript', 'application/json', 'image/svg+xml'
+}
+
+
+class ResponseCompressor:
+    """Compresses text responses with brotli or gzip, per Accept-Encoding.
+
+    Views marked with ``shared`` render identically for every user, such as
+    the patient dashboard shell; their compressed bodies are memoized by a
+    digest of the uncompressed bytes and served from memory. Everything else
+    is compressed per response without being stored. Brotli is used only
+    when the ``brotli`` package is installed.
+    """
+
+    def __init__(self, min_size=500, gzip_level=6, brotli_quality=5, max_entries=64):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.max_entries = max_entries
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.after_request(self.compress_response)
+
+    def shared(self, view):
+        """Memoize the compressed output of a view that does not vary per user"""
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            g.memoize_compression = True
+            return view(*args, **kwargs)
+        return wrapped
+
+    def _choose_encoding(self):
+        accepted = request.accept_encodings
+        if brotli is not None and accepted['br'] > 0:
+            return 'br'
+        if accepted['gzip'] > 0:
+            return 'gzip'
+        return None
+
+    def _compress(self, body, encoding):
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def _compress_memoized(self, body, encoding):
+        key = (encoding, hashlib.sha1(body).digest())
+        with self._lock:
+            compressed = self._memo.get(key)
+            if compressed is not None:
+                self._memo.move_to_end(key)
+                return compressed
+        compressed = self._compress(body, encoding)
+        with self._lock:
+            self._memo[key] = compressed
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+        return compressed
+
+    def compress_response(self, response):
+        if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+        body = response.get_data()
+        if len(body) < self.min_size:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self._choose_encoding()
+        if encoding is None:
+            return response
+
+        if g.get('memoize_compression'):
+            response.set_data(self._compress_memoized(body, encoding))
+        else:
+            response.set_data(self._compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+        # The compressed bytes differ from the identity body, so a strong ETag no longer applies.
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,75 @@
+import threading
+
+
+class IdNumbersExhausted(Exception):
+    pass
+
+
+class IdNumberAllocator:
+    """Collision-free allocator for 5-digit patient ID numbers.
+
+    Fresh IDs walk a fixed affine permutation of the ID space, so consecutive
+    patients get unrelated-looking numbers but the sequence never repeats.
+    The position in the sequence is reserved in blocks through ``reserve``,
+    which must persist the new high-water mark and return it, so workers
+    sharing the database never get the same block. Once the sequence runs
+    out, ``recycle(count)`` must claim up to ``count`` IDs that ``release``
+    put back into the same shared storage, so an ID freed on one worker can
+    be reused on any other. The unused rest of a block is skipped when its
+    worker restarts.
+    """
+
+    LOW = 10000
+    SIZE = 90000
+    # Any multiplier coprime with SIZE gives a full-period permutation.
+    MULTIPLIER = 46337
+    OFFSET = 12345
+
+    def __init__(self, reserve, recycle, release, block_size=100):
+        self._reserve = reserve
+        self._recycle = recycle
+        self._release = release
+        self.block_size = block_size
+        self._next = 0
+        self._limit = 0
+        self._taken = set()
+        self._lock = threading.Lock()
+
+    def permute(self, n):
+        return str(self.LOW + (self.MULTIPLIER * n + self.OFFSET) % self.SIZE)
+
+    def load(self, high_water, taken_ids):
+        """Restore state from the persisted high-water mark and the IDs in use"""
+        with self._lock:
+            self._taken = set(taken_ids)
+            self._next = self._limit = high_water
+
+    def allocate(self):
+        return self.allocate_many(1)[0]
+
+    def allocate_many(self, count):
+        """Allocate ``count`` IDs, or raise IdNumbersExhausted if the space runs out part way"""
+        allocated = []
+        with self._lock:
+            while len(allocated) < count and self._next < self.SIZE:
+                if self._next >= self._limit:
+                    self._limit = self._reserve(self.block_size)
+                    self._next = self._limit - self.block_size
+                    # The block may start past the end of the sequence.
+                    continue
+                id_number = self.permute(self._next)
+                self._next += 1
+                # Rows created before the allocator existed may already hold it.
+                if id_number not in self._taken:
+                    allocated.append(id_number)
+        if len(allocated) < count:
+            allocated.extend(self._recycle(count - len(allocated)))
+            if len(allocated) < count:
+                self.release(allocated)
+                raise IdNumbersExhausted('All patient ID numbers are in use')
+        return allocated
+
+    def release(self, id_numbers):
+        """Hand back IDs that were allocated but never stored"""
+        if id_numbers:
+            self._release(id_numbers)
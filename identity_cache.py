@@ -0,0 +1,40 @@
+import threading
+import time
+
+
+class IdentityCache:
+    """Short-lived, in-process cache of authenticated user rows.
+
+    Stores plain column snapshots rather than ORM instances so entries never
+    hold on to a closed session. Entries expire after ``ttl`` seconds and are
+    dropped explicitly on logout, discharge and patient updates.
+    """
+
+    def __init__(self, ttl=30, max_entries=10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, values = entry
+        if expires_at < time.monotonic():
+            self.invalidate(key)
+            return None
+        return values
+
+    def set(self, key, values):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] >= now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (now + self.ttl, values)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
@@ -0,0 +1,88 @@
+import os
+
+from flask import url_for
+
+from static_assets import atomic_write
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+VARIANT_WIDTHS = (80, 160, 320, 640, 1280)
+RESIZABLE_EXTENSIONS = {'.png', '.jpg', '.jpeg'}
+
+
+class ImageVariants:
+    """Downscaled WebP copies of the fingerprinted template images.
+
+    Variants are written once per content hash to ``cache_dir`` and served
+    through the asset manifest, so they get the same immutable caching as
+    the originals. Only widths smaller than the source are produced. Without
+    Pillow no variants are built and templates fall back to the originals.
+    """
+
+    def __init__(self, manifest, cache_dir, widths=VARIANT_WIDTHS, quality=80):
+        self.manifest = manifest
+        self.cache_dir = cache_dir
+        self.widths = widths
+        self.quality = quality
+        self.variants = {}
+        self.source_widths = {}
+
+    def build(self):
+        self.variants, self.source_widths = {}, {}
+        if Image is None:
+            print("Pillow is not installed, serving original images only")
+            return self
+        for name, hashed in self.manifest.hashed_names.items():
+            if os.path.splitext(name)[1].lower() not in RESIZABLE_EXTENSIONS:
+                continue
+            try:
+                self._build_image(name, hashed)
+            except OSError as e:
+                print(f"Error building image variants for {name}: {e}")
+        return self
+
+    def _build_image(self, name, hashed):
+        stem = os.path.splitext(hashed)[0]
+        with Image.open(self.manifest.sources[hashed]) as image:
+            self.source_widths[name] = image.width
+            variants = []
+            for width in self.widths:
+                if width >= image.width:
+                    break
+                variant = f'{stem}.{width}w.webp'
+                path = os.path.join(self.cache_dir, variant)
+                if not os.path.exists(path):
+                    self._write_variant(image, width, path)
+                self.manifest.add(variant, path)
+                variants.append((width, variant))
+        self.variants[name] = variants
+
+    def _write_variant(self, image, width, path):
+        height = max(1, round(image.height * width / image.width))
+        mode = 'RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB'
+        resized = image.convert(mode).resize((width, height), Image.LANCZOS)
+        with atomic_write(path) as f:
+            resized.save(f, 'WEBP', quality=self.quality)
+
+    def srcset(self, name):
+        """Candidate list for an ``<img srcset>``, ending with the original"""
+        variants = self.variants.get(name)
+        if not variants:
+            return ''
+        candidates = [f"{url_for('hashed_asset', filename=variant)} {width}w" for width, variant in variants]
+        candidates.append(f'{self.manifest.url(name)} {self.source_widths[name]}w')
+        return ', '.join(candidates)
+
+    def url(self, name, width):
+        """Smallest variant at least ``width`` pixels wide, or the original"""
+        for variant_width, variant in self.variants.get(name, ()):
+            if variant_width >= width:
+                return url_for('hashed_asset', filename=variant)
+        return self.manifest.url(name)
+
+    def init_app(self, app):
+        app.add_template_global(self.srcset, 'asset_srcset')
+        app.add_template_global(self.url, 'asset_variant')
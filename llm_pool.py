@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import deque
+
+from blocking_pool import BlockingPool
+
+
+class LLMWorkerPool:
+    """Bounded queue of model requests served by Socket.IO background workers.
+
+    ``submit`` returns immediately; one of ``max_concurrency`` workers later
+    runs the request through a ``BlockingPool`` so the blocking HTTP call
+    stays off the event loop, then hands ``(result, error)`` to the callback
+    in a new background task. Each request must finish within ``timeout``
+    seconds of submission; ``fn`` receives that deadline as a
+    ``time.monotonic()`` value and is expected to give up once it passes,
+    along with a callable that turns true when the request is cancelled.
+    Requests for a game can be cancelled when it ends, and a
+    full queue rejects new requests instead of growing without bound.
+    """
+
+    def __init__(self, socketio, max_concurrency=4, timeout=15, max_queue=100):
+        self.socketio = socketio
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_queue = max_queue
+        self.blocking = BlockingPool(socketio, max_workers=max_concurrency)
+        # Idle workers block on the queue instead of polling it.
+        self._queue = socketio.server.eio.create_queue()
+        self._jobs_by_key = {}
+        self._started = False
+        self._lock = threading.Lock()
+        self.counts = {'completed': 0, 'failed': 0, 'timed_out': 0, 'cancelled': 0, 'rejected': 0}
+
+    def submit(self, key, fn, callback):
+        """Queue ``fn(deadline, cancelled)`` for ``key`` and call ``callback(result, error)`` when it finishes.
+
+        Returns the queued job, or None when the queue is full and the
+        callback will not be called.
+        """
+        self._start()
+        job = {'key': key, 'fn': fn, 'callback': callback,
+               'deadline': time.monotonic() + self.timeout, 'cancelled': False}
+        with self._lock:
+            if self._queue.qsize() >= self.max_queue:
+                self.counts['rejected'] += 1
+                return None
+            self._queue.put(job)
+            self._jobs_by_key.setdefault(key, []).append(job)
+        return job
+
+    def cancel(self, key):
+        """Drop queued requests for ``key`` and discard the results of running ones"""
+        with self._lock:
+            for job in self._jobs_by_key.pop(key, ()):
+                job['cancelled'] = True
+
+    def _start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for _ in range(self.max_concurrency):
+            self.socketio.start_background_task(self._worker)
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._process(job)
+            except Exception as e:
+                print(f"Error running model request: {e}")
+            finally:
+                self._forget(job)
+
+    def _process(self, job):
+        if job['cancelled']:
+            self._count('cancelled')
+            return
+        if job['deadline'] <= time.monotonic():
+            self._count('timed_out')
+            self.socketio.start_background_task(job['callback'], None, TimeoutError('request expired in queue'))
+            return
+
+        result, error = None, None
+        try:
+            result = self.blocking.run(job['fn'], job['deadline'], lambda: job['cancelled'])
+        except Exception as e:
+            error = e
+        if job['cancelled']:
+            self._count('cancelled')
+            return
+        self._count('failed' if error else 'completed')
+        self.socketio.start_background_task(job['callback'], result, error)
+
+    def _forget(self, job):
+        with self._lock:
+            jobs = self._jobs_by_key.get(job['key'])
+            if jobs and job in jobs:
+                jobs.remove(job)
+                if not jobs:
+                    del self._jobs_by_key[job['key']]
+
+    def _count(self, outcome):
+        with self._lock:
+            self.counts[outcome] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(
+                self.counts,
+                queue_depth=self._queue.qsize(),
+                active=self.blocking.active,
+                max_concurrency=self.max_concurrency
+            )
+
+
+class ReplyStream:
+    """Carries text produced by a streaming request on a worker thread to a Socket.IO task.
+
+    The worker calls ``push`` for each piece and the pool callback calls
+    ``finish``; the relaying task polls ``drain`` until ``done`` is set.
+    """
+
+    def __init__(self):
+        self._pieces = deque()
+        self.done = False
+        self.reply = None
+        self.error = None
+
+    def push(self, text):
+        self._pieces.append(text)
+
+    def drain(self):
+        pieces = []
+        while self._pieces:
+            pieces.append(self._pieces.popleft())
+        return ''.join(pieces)
+
+    def finish(self, reply, error):
+        self.reply, self.error = reply, error
+        self.done = True
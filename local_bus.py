@@ -0,0 +1,145 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+import socketio
+
+
+class SQLiteBus:
+    """Broadcast bus for processes on one machine, backed by a SQLite file.
+
+    ``publish`` appends a message to a WAL-mode table; every process polls
+    for rows newer than the last one it has seen and hands them to the
+    callbacks subscribed to that channel. A process never receives its own
+    messages. Old rows are pruned after ``retention`` seconds. With no path
+    the bus is disabled and publishing is a no-op, which is the
+    single-process default.
+    """
+
+    def __init__(self, path=None, poll_interval=0.2, retention=60):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self.origin = uuid.uuid4().hex
+        self._subscribers = {}
+        self._last_seq = 0
+        self._conn = None
+        self._started = False
+        self._lock = threading.Lock()
+        if path:
+            self._connect()
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def _connect(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS bus_messages ('
+            'seq INTEGER PRIMARY KEY AUTOINCREMENT, channel TEXT NOT NULL, '
+            'origin TEXT NOT NULL, payload TEXT NOT NULL, created REAL NOT NULL)'
+        )
+        # Only messages published after this process started are relevant.
+        self._last_seq = self._conn.execute('SELECT COALESCE(MAX(seq), 0) FROM bus_messages').fetchone()[0]
+
+    def subscribe(self, channel, callback):
+        self._subscribers.setdefault(channel, []).append(callback)
+
+    def publish(self, channel, payload):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO bus_messages (channel, origin, payload, created) VALUES (?, ?, ?, ?)',
+                (channel, self.origin, json.dumps(payload), time.time())
+            )
+
+    def fetch(self):
+        """Return (channel, origin, payload) for every message since the last fetch, including our own"""
+        if not self.enabled:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT seq, channel, origin, payload FROM bus_messages WHERE seq > ? ORDER BY seq',
+                (self._last_seq,)
+            ).fetchall()
+            if rows:
+                self._last_seq = rows[-1][0]
+        return [(channel, origin, json.loads(payload)) for _, channel, origin, payload in rows]
+
+    def poll(self):
+        """Dispatch messages published by other processes since the last poll"""
+        messages = self.fetch()
+        for channel, origin, payload in messages:
+            if origin == self.origin:
+                continue
+            for callback in self._subscribers.get(channel, ()):
+                try:
+                    callback(payload)
+                except Exception as e:
+                    print(f"Error handling bus message on {channel}: {e}")
+        return len(messages)
+
+    def prune(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._conn.execute('DELETE FROM bus_messages WHERE created < ?', (time.time() - self.retention,))
+
+    def start(self, socketio):
+        """Start polling in a Socket.IO background task"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        socketio.start_background_task(self._run, socketio)
+
+    def _run(self, socketio):
+        last_prune = time.monotonic()
+        while True:
+            socketio.sleep(self.poll_interval)
+            try:
+                self.poll()
+                if time.monotonic() - last_prune > self.retention:
+                    self.prune()
+                    last_prune = time.monotonic()
+            except Exception as e:
+                print(f"Error polling bus: {e}")
+
+
+class SQLiteClientManager(socketio.PubSubManager):
+    """Socket.IO client manager that relays emits between processes through a SQLite file.
+
+    A stand-in for the Redis or AMQP managers when every worker runs on the
+    same machine: room emits, disconnects and callbacks are written to a
+    ``SQLiteBus`` and replayed by the listener of every worker.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path, channel='socketio', write_only=False, logger=None, poll_interval=0.05):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.bus = SQLiteBus(path, poll_interval=poll_interval)
+
+    def _publish(self, data):
+        self.bus.publish(self.channel, data)
+
+    def _listen(self):
+        last_prune = time.monotonic()
+        while True:
+            for channel, _, payload in self.bus.fetch():
+                if channel == self.channel:
+                    yield payload
+            if time.monotonic() - last_prune > self.bus.retention:
+                self.bus.prune()
+                last_prune = time.monotonic()
+            self.server.sleep(self.bus.poll_interval)
@@ -0,0 +1,67 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Per-key token bucket rate limiter"""
+
+    def __init__(self, rate_per_minute=10, burst=10, max_keys=100000):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key):
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            if len(self._buckets) >= self.max_keys and key not in self._buckets:
+                self._prune(now)
+            self._buckets[key] = (tokens, now)
+            return allowed
+
+    def _prune(self, now):
+        # Buckets that have refilled completely carry no state worth keeping.
+        refill = self.burst / self.rate if self.rate else float('inf')
+        self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < refill}
+        if len(self._buckets) >= self.max_keys:
+            self._buckets.clear()
+
+
+class NegativeLoginCache:
+    """Remembers recently failed (id_number, last_name) pairs.
+
+    Entries are grouped by id_number so admitting a patient can drop every
+    cached failure for their number immediately. Names are kept exactly as
+    typed, since the database may compare them case-sensitively.
+    """
+
+    def __init__(self, ttl=60, max_entries=100000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def is_known_bad(self, id_number, last_name):
+        expires_at = self._entries.get(id_number, {}).get(last_name)
+        return expires_at is not None and expires_at > time.monotonic()
+
+    def remember(self, id_number, last_name):
+        with self._lock:
+            if self._size >= self.max_entries:
+                self._entries.clear()
+                self._size = 0
+            names = self._entries.setdefault(id_number, {})
+            if last_name not in names:
+                self._size += 1
+            names[last_name] = time.monotonic() + self.ttl
+
+    def forget(self, id_number):
+        with self._lock:
+            self._size -= len(self._entries.pop(id_number, {}))
@@ -0,0 +1,273 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+
+
+class Matchmaker:
+    """Waiting queue and active game registry for the guessing game.
+
+    Waiting players sit in a deque with a per-user index, so joining,
+    matching and cancelling are O(1): cancelled entries are only dropped from
+    the index and skipped when they reach the head of the deque. Games are
+    indexed by socket id so a disconnect ends them right away, and a
+    periodic sweep drops games and waiting entries that have gone idle.
+    """
+
+    def __init__(self, idle_timeout=900, waiting_timeout=300, sweep_interval=60):
+        self.idle_timeout = idle_timeout
+        self.waiting_timeout = waiting_timeout
+        self.sweep_interval = sweep_interval
+        self._waiting = deque()
+        self._waiting_by_user = {}
+        self._games = {}
+        self._games_by_sid = {}
+        self._started = False
+        self._lock = threading.Lock()
+
+    def enqueue(self, player):
+        """Add a player to the waiting queue, replacing any earlier entry of theirs"""
+        with self._lock:
+            player['queued_at'] = time.monotonic()
+            self._waiting_by_user[player['id']] = player
+            self._waiting.append(player)
+
+    def cancel(self, user_id):
+        with self._lock:
+            return self._waiting_by_user.pop(user_id, None) is not None
+
+    def pop_opponent(self, user_id):
+        """Take the longest-waiting player other than ``user_id``, if any"""
+        with self._lock:
+            while self._waiting:
+                player = self._waiting[0]
+                if self._waiting_by_user.get(player['id']) is not player:
+                    self._waiting.popleft()
+                    continue
+                if player['id'] == user_id:
+                    return None
+                self._waiting.popleft()
+                del self._waiting_by_user[player['id']]
+                return player
+            return None
+
+    def create_game(self, players, is_bot):
+        game_id = f'game_{uuid.uuid4().hex}'
+        game = {
+            'players': players,
+            'messages': [],
+            'is_bot': is_bot,
+            'last_sender': None,
+            'last_active': time.monotonic()
+        }
+        with self._lock:
+            self._games[game_id] = game
+            for player in players:
+                self._games_by_sid.setdefault(player['socket_id'], set()).add(game_id)
+        return game_id, game
+
+    def get_game(self, game_id):
+        game = self._games.get(game_id)
+        if game is not None:
+            game['last_active'] = time.monotonic()
+        return game
+
+    def save_game(self, game_id, game):
+        """Persist changes made to a game returned by ``get_game``"""
+        game['last_active'] = time.monotonic()
+
+    def end_game(self, game_id):
+        with self._lock:
+            return self._end_game(game_id)
+
+    def _end_game(self, game_id):
+        game = self._games.pop(game_id, None)
+        if game is None:
+            return None
+        for player in game['players']:
+            game_ids = self._games_by_sid.get(player['socket_id'])
+            if game_ids is not None:
+                game_ids.discard(game_id)
+                if not game_ids:
+                    del self._games_by_sid[player['socket_id']]
+        return game
+
+    def disconnect(self, user_id, socket_id):
+        """Drop the socket's waiting entry, end every game it was part of and return their ids"""
+        with self._lock:
+            player = self._waiting_by_user.get(user_id)
+            if player is not None and player['socket_id'] == socket_id:
+                del self._waiting_by_user[user_id]
+            game_ids = list(self._games_by_sid.get(socket_id, ()))
+            for game_id in game_ids:
+                self._end_game(game_id)
+            return game_ids
+
+    def sweep(self):
+        now = time.monotonic()
+        with self._lock:
+            for user_id, player in list(self._waiting_by_user.items()):
+                if now - player['queued_at'] > self.waiting_timeout:
+                    del self._waiting_by_user[user_id]
+            # Rebuild the deque so cancelled entries do not pile up behind a long wait.
+            self._waiting = deque(p for p in self._waiting if self._waiting_by_user.get(p['id']) is p)
+            for game_id, game in list(self._games.items()):
+                if now - game['last_active'] > self.idle_timeout:
+                    self._end_game(game_id)
+
+    def start(self, socketio):
+        """Start the periodic sweep in a Socket.IO background task"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        socketio.start_background_task(self._run, socketio)
+
+    def _run(self, socketio):
+        while True:
+            socketio.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Error sweeping games: {e}")
+
+    def stats(self):
+        return {
+            'waiting': len(self._waiting_by_user),
+            'games': len(self._games),
+            'sockets': len(self._games_by_sid)
+        }
+
+
+class SQLiteMatchmaker(Matchmaker):
+    """Matchmaker whose waiting queue and games live in a SQLite file.
+
+    Every worker process on the machine opens the same file, so a player
+    connected to one worker can be matched with a player on another and game
+    events can be handled by either. Games are returned as copies, so
+    handlers must call ``save_game`` after changing one.
+    """
+
+    def __init__(self, path, idle_timeout=900, waiting_timeout=300, sweep_interval=60):
+        super().__init__(idle_timeout, waiting_timeout, sweep_interval)
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(
+            'CREATE TABLE IF NOT EXISTS mm_waiting ('
+            'user_id TEXT PRIMARY KEY, socket_id TEXT NOT NULL, player TEXT NOT NULL, queued_at REAL NOT NULL);'
+            'CREATE INDEX IF NOT EXISTS idx_mm_waiting_queued_at ON mm_waiting (queued_at);'
+            'CREATE TABLE IF NOT EXISTS mm_games ('
+            'game_id TEXT PRIMARY KEY, state TEXT NOT NULL, last_active REAL NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS mm_game_sockets ('
+            'socket_id TEXT NOT NULL, game_id TEXT NOT NULL, PRIMARY KEY (socket_id, game_id));'
+            'CREATE INDEX IF NOT EXISTS idx_mm_game_sockets_game ON mm_game_sockets (game_id);'
+        )
+
+    def _transaction(self, statements):
+        """Run ``statements(conn)`` inside a write transaction and return its result"""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = statements(self._conn)
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+            return result
+
+    def enqueue(self, player):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO mm_waiting (user_id, socket_id, player, queued_at) VALUES (?, ?, ?, ?)',
+                (player['id'], player['socket_id'], json.dumps(player), time.time())
+            )
+
+    def cancel(self, user_id):
+        with self._lock:
+            return self._conn.execute('DELETE FROM mm_waiting WHERE user_id = ?', (user_id,)).rowcount > 0
+
+    def pop_opponent(self, user_id):
+        def pop(conn):
+            row = conn.execute('SELECT user_id, player FROM mm_waiting ORDER BY queued_at LIMIT 1').fetchone()
+            if row is None or row[0] == user_id:
+                return None
+            conn.execute('DELETE FROM mm_waiting WHERE user_id = ?', (row[0],))
+            return json.loads(row[1])
+        return self._transaction(pop)
+
+    def create_game(self, players, is_bot):
+        game_id = f'game_{uuid.uuid4().hex}'
+        game = {'players': players, 'messages': [], 'is_bot': is_bot, 'last_sender': None}
+
+        def insert(conn):
+            conn.execute(
+                'INSERT INTO mm_games (game_id, state, last_active) VALUES (?, ?, ?)',
+                (game_id, json.dumps(game), time.time())
+            )
+            conn.executemany(
+                'INSERT OR IGNORE INTO mm_game_sockets (socket_id, game_id) VALUES (?, ?)',
+                [(player['socket_id'], game_id) for player in players]
+            )
+        self._transaction(insert)
+        return game_id, game
+
+    def get_game(self, game_id):
+        with self._lock:
+            row = self._conn.execute('SELECT state FROM mm_games WHERE game_id = ?', (game_id,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE mm_games SET last_active = ? WHERE game_id = ?', (time.time(), game_id))
+        return json.loads(row[0])
+
+    def save_game(self, game_id, game):
+        with self._lock:
+            self._conn.execute(
+                'UPDATE mm_games SET state = ?, last_active = ? WHERE game_id = ?',
+                (json.dumps(game), time.time(), game_id)
+            )
+
+    def end_game(self, game_id):
+        return self._transaction(lambda conn: self._delete_game(conn, game_id))
+
+    def _delete_game(self, conn, game_id):
+        row = conn.execute('SELECT state FROM mm_games WHERE game_id = ?', (game_id,)).fetchone()
+        if row is None:
+            return None
+        conn.execute('DELETE FROM mm_games WHERE game_id = ?', (game_id,))
+        conn.execute('DELETE FROM mm_game_sockets WHERE game_id = ?', (game_id,))
+        return json.loads(row[0])
+
+    def disconnect(self, user_id, socket_id):
+        def drop(conn):
+            conn.execute('DELETE FROM mm_waiting WHERE user_id = ? AND socket_id = ?', (user_id, socket_id))
+            game_ids = [row[0] for row in conn.execute(
+                'SELECT game_id FROM mm_game_sockets WHERE socket_id = ?', (socket_id,)
+            ).fetchall()]
+            for game_id in game_ids:
+                self._delete_game(conn, game_id)
+            return game_ids
+        return self._transaction(drop)
+
+    def sweep(self):
+        now = time.time()
+
+        def expire(conn):
+            conn.execute('DELETE FROM mm_waiting WHERE queued_at < ?', (now - self.waiting_timeout,))
+            game_ids = [row[0] for row in conn.execute(
+                'SELECT game_id FROM mm_games WHERE last_active < ?', (now - self.idle_timeout,)
+            ).fetchall()]
+            for game_id in game_ids:
+                self._delete_game(conn, game_id)
+        self._transaction(expire)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'waiting': self._conn.execute('SELECT COUNT(*) FROM mm_waiting').fetchone()[0],
+                'games': self._conn.execute('SELECT COUNT(*) FROM mm_games').fetchone()[0],
+                'sockets': self._conn.execute('SELECT COUNT(DISTINCT socket_id) FROM mm_game_sockets').fetchone()[0]
+            }
@@ -0,0 +1,50 @@
+import threading
+
+
+class QueueBroadcaster:
+    """Pushes queue position/ETA changes to patient rooms.
+
+    Writers only mark the queue dirty; a background task wakes once per tick,
+    takes one snapshot and emits just the entries that changed since the last
+    tick, so a burst of admissions and discharges becomes a single diff.
+    Every worker runs its own broadcaster, so emits skip the message queue
+    and only reach the patients connected to this process.
+    """
+
+    def __init__(self, socketio, snapshot, interval=1.0, event='queue_update'):
+        self.socketio = socketio
+        self.snapshot = snapshot
+        self.interval = interval
+        self.event = event
+        self._dirty = False
+        self._last = {}
+        self._started = False
+        self._lock = threading.Lock()
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.socketio.start_background_task(self._run)
+
+    def _run(self):
+        while True:
+            self.socketio.sleep(self.interval)
+            if self._dirty:
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"Error broadcasting queue update: {e}")
+
+    def flush(self):
+        self._dirty = False
+        current = self.snapshot()
+        last = self._last
+        for patient_id, payload in current.items():
+            if last.get(patient_id) != payload:
+                self.socketio.emit(self.event, payload, room=f'patient_{patient_id}', ignore_queue=True)
+        self._last = current
@@ -0,0 +1,215 @@
+"""Discrete-event ER load simulator.
+
+Generates synthetic arrivals, triage levels, tasks, patient polls and
+discharges and replays them through the Flask test client against a local
+database, then reports latency percentiles, queries per request and
+throughput per endpoint.
+
+    python simulate_load.py --patients-per-day 10000 --hours 2
+"""
+import argparse
+import contextlib
+import heapq
+import io
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.queries = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.current_queries = 0
+
+    def count_query(self, *args, **kwargs):
+        self.current_queries += 1
+
+    def measure(self, name, call):
+        self.current_queries = 0
+        # The app prints on every patient-info request; keep the report readable.
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            response = call()
+            elapsed = time.perf_counter() - start
+        self.latencies[name].append(elapsed * 1000)
+        self.queries[name] += self.current_queries
+        self.statuses[name][response.status_code] += 1
+        return response
+
+    def report(self, wall_seconds, out=sys.stdout):
+        total = sum(len(v) for v in self.latencies.values())
+        header = f"{'endpoint':<20}{'requests':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries/req':>13}  statuses"
+        print(header, file=out)
+        print('-' * len(header), file=out)
+        for name in sorted(self.latencies):
+            values = sorted(self.latencies[name])
+            statuses = ', '.join(f'{code}x{count}' for code, count in sorted(self.statuses[name].items()))
+            print(
+                f"{name:<20}{len(values):>10}{percentile(values, 50):>10.2f}{percentile(values, 95):>10.2f}"
+                f"{percentile(values, 99):>10.2f}{self.queries[name] / len(values):>13.2f}  {statuses}",
+                file=out
+            )
+        print('-' * len(header), file=out)
+        print(f"{total} requests in {wall_seconds:.2f}s ({total / wall_seconds if wall_seconds else 0:.1f} req/s)", file=out)
+
+
+class Simulation:
+    ARRIVAL, POLL, TASK, DISCHARGE = 'arrival', 'poll', 'task', 'discharge'
+
+    def __init__(self, app_module, args):
+        self.m = app_module
+        self.app = app_module.app
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.recorder = Recorder()
+        self.events = []
+        self.seq = 0
+        self.waiting = []
+        self.clients = {}
+        self.levels = {}
+        self.nurse = self.app.test_client()
+
+    def schedule(self, at, kind, payload=None):
+        self.seq += 1
+        heapq.heappush(self.events, (at, self.seq, kind, payload))
+
+    def setup(self):
+        m = self.m
+        with self.app.app_context():
+            m.db.drop_all()
+            m.db.create_all()
+            nurse = m.Nurses(username='sim-nurse')
+            nurse.set_password('sim-password')
+            m.db.session.add(nurse)
+            m.db.session.commit()
+            m.rebuild_triage_queue()
+            from sqlalchemy import event
+            event.listen(m.db.engine, 'before_cursor_execute', self.recorder.count_query)
+        self.nurse.post('/login', data={'user_type': 'nurse', 'username': 'sim-nurse', 'password': 'sim-password'})
+
+    def newest_patient(self):
+        with self.app.app_context():
+            patient = self.m.Patients.query.order_by(self.m.Patients.id.desc()).first()
+            return patient.id, patient.last_name, patient.id_number
+
+    def on_arrival(self, now, schedule_next=True):
+        args = self.args
+        level = self.rng.choices([1, 2, 3, 4, 5], weights=[30, 30, 20, 12, 8])[0]
+        name = f'Sim{self.seq}'
+        self.recorder.measure('add_patient', lambda: self.nurse.post(
+            '/add-patient', data={'last_name': name, 'danger_level': level}
+        ))
+        patient_id, last_name, id_number = self.newest_patient()
+        client = self.app.test_client()
+        # Each simulated device gets its own address so the login rate limiter sees distinct clients.
+        address = f'10.{patient_id >> 16 & 255}.{patient_id >> 8 & 255}.{patient_id & 255}'
+        self.recorder.measure('login', lambda: client.post(
+            '/login', data={'user_type': 'patient', 'username': last_name, 'password': id_number},
+            environ_base={'REMOTE_ADDR': address}
+        ))
+        self.clients[patient_id] = client
+        self.levels[patient_id] = level
+        heapq.heappush(self.waiting, (-level, now, patient_id))
+
+        if schedule_next:
+            self.schedule(now + self.rng.expovariate(args.patients_per_day / 86400.0), self.ARRIVAL)
+        self.schedule(now + self.rng.uniform(0, args.poll_interval), self.POLL, patient_id)
+        if self.rng.random() < args.task_probability:
+            self.schedule(now + self.rng.expovariate(1 / 600.0), self.TASK, patient_id)
+
+    def on_poll(self, now, patient_id):
+        client = self.clients.get(patient_id)
+        if client is None:
+            return
+        self.recorder.measure('patient-info', lambda: client.get('/api/patient-info'))
+        self.recorder.measure('notifications', lambda: client.get('/api/notifications'))
+        self.schedule(now + self.args.poll_interval, self.POLL, patient_id)
+
+    def on_task(self, now, patient_id):
+        if patient_id not in self.clients:
+            return
+        self.recorder.measure('add_task', lambda: self.nurse.post(
+            f'/add_task/{patient_id}', data={'task_message': 'Please return to triage desk'}
+        ))
+        # Nobody renders the flashed messages; don't let the cookie grow.
+        with self.nurse.session_transaction() as sess:
+            sess.pop('_flashes', None)
+
+    def on_discharge(self, now):
+        while self.waiting:
+            _, _, patient_id = heapq.heappop(self.waiting)
+            if patient_id in self.clients:
+                break
+        else:
+            patient_id = None
+        if patient_id is not None:
+            self.recorder.measure('delete_patient', lambda: self.nurse.post(f'/delete_patient/{patient_id}'))
+            self.clients.pop(patient_id, None)
+        rate = self.args.patients_per_day * self.args.discharge_ratio / 86400.0
+        self.schedule(now + self.rng.expovariate(rate), self.DISCHARGE)
+
+    def run(self):
+        args = self.args
+        end = args.hours * 3600
+        # Start with a backlog so the queue is realistic from the first poll.
+        for _ in range(args.initial_waiting):
+            self.on_arrival(0, schedule_next=False)
+        self.schedule(self.rng.expovariate(args.patients_per_day / 86400.0), self.ARRIVAL)
+        self.schedule(self.rng.expovariate(args.patients_per_day / 86400.0), self.DISCHARGE)
+
+        handlers = {
+            self.ARRIVAL: lambda now, _: self.on_arrival(now),
+            self.POLL: self.on_poll,
+            self.TASK: self.on_task,
+            self.DISCHARGE: lambda now, _: self.on_discharge(now),
+        }
+        started = time.perf_counter()
+        while self.events:
+            now, _, kind, payload = heapq.heappop(self.events)
+            if now > end:
+                break
+            handlers[kind](now, payload)
+        return time.perf_counter() - started
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database-url', default='sqlite:///er_sim.db',
+                        help='database to run against; it is dropped and recreated')
+    parser.add_argument('--patients-per-day', type=float, default=10000)
+    parser.add_argument('--discharge-ratio', type=float, default=1.0,
+                        help='discharge rate as a fraction of the arrival rate')
+    parser.add_argument('--hours', type=float, default=1.0, help='simulated hours to run')
+    parser.add_argument('--poll-interval', type=float, default=30.0, help='seconds between patient polls')
+    parser.add_argument('--task-probability', type=float, default=0.3)
+    parser.add_argument('--initial-waiting', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=2005)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.environ['DATABASE_URL'] = args.database_url
+    import app as app_module
+    app_module.app.config['WTF_CSRF_ENABLED'] = False
+
+    simulation = Simulation(app_module, args)
+    simulation.setup()
+    wall_seconds = simulation.run()
+    print(f"Simulated {args.hours}h at {args.patients_per_day:.0f} patients/day against {args.database_url}")
+    simulation.recorder.report(wall_seconds)
+
+
+if __name__ == '__main__':
+    main()
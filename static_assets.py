@@ -0,0 +1,110 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from flask import request, send_file, url_for
+
+IMMUTABLE_MAX_AGE = 31536000
+ASSET_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.ico', '.css', '.js', '.mp4', '.woff2'}
+# Images and video are already compressed; gzip only pays off for text formats.
+COMPRESSIBLE_EXTENSIONS = {'.svg', '.css', '.js'}
+
+
+@contextmanager
+def atomic_write(path):
+    """Write ``path`` through a temp file that is moved into place once complete"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Workers may build the same file at once, so each writes its own temp file.
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class AssetManifest:
+    """Content-hashed URLs for the files in the static folder.
+
+    ``build`` hashes every asset once and maps ``bonsai.png`` to
+    ``bonsai.<hash>.png``. Hashed names change whenever the bytes do, so the
+    ``/assets`` route can serve them as immutable for a year. Text assets get
+    a precompressed ``.gz`` copy in ``cache_dir`` that is sent to clients
+    which accept gzip.
+    """
+
+    def __init__(self, folder, cache_dir):
+        self.folder = folder
+        self.cache_dir = cache_dir
+        self.hashed_names = {}
+        self.sources = {}
+
+    def build(self):
+        hashed_names, sources = {}, {}
+        for name in os.listdir(self.folder):
+            path = os.path.join(self.folder, name)
+            stem, ext = os.path.splitext(name)
+            if ext.lower() not in ASSET_EXTENSIONS or not os.path.isfile(path):
+                continue
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(65536), b''):
+                    digest.update(chunk)
+            hashed = f'{stem}.{digest.hexdigest()[:12]}{ext}'
+            hashed_names[name] = hashed
+            sources[hashed] = path
+            if ext.lower() in COMPRESSIBLE_EXTENSIONS:
+                self._write_gzip(path, hashed)
+        self.hashed_names, self.sources = hashed_names, sources
+        return self
+
+    def _write_gzip(self, path, hashed):
+        target = os.path.join(self.cache_dir, hashed + '.gz')
+        if os.path.exists(target):
+            return
+        with open(path, 'rb') as src, atomic_write(target) as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=9) as dst:
+            shutil.copyfileobj(src, dst)
+
+    def add(self, hashed, path):
+        """Serve a derived file, such as a resized image, under /assets"""
+        self.sources[hashed] = path
+
+    def url(self, name):
+        hashed = self.hashed_names.get(name)
+        if hashed is None:
+            # Unknown or missing files keep their plain, revalidated URL.
+            return '/' + name
+        return url_for('hashed_asset', filename=hashed)
+
+    def response(self, filename):
+        path = self.sources.get(filename)
+        if path is None:
+            return None
+        compressed = os.path.join(self.cache_dir, filename + '.gz')
+        if 'gzip' in request.headers.get('Accept-Encoding', '') and os.path.exists(compressed):
+            response = send_file(compressed, mimetype=mimetypes.guess_type(path)[0], max_age=IMMUTABLE_MAX_AGE)
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = send_file(path, max_age=IMMUTABLE_MAX_AGE, conditional=True)
+        if os.path.splitext(filename)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+            response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    def init_app(self, app):
+        app.add_template_global(self.url, 'asset_url')
+        app.add_url_rule('/assets/<path:filename>', 'hashed_asset', self._serve)
+
+    def _serve(self, filename):
+        response = self.response(filename)
+        if response is None:
+            return 'Not found', 404
+        return response
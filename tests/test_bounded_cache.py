@@ -0,0 +1,85 @@
+import threading
+import time
+
+from bounded_cache import LRUCache, SingleFlight
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(threshold=3, jitter=0)
+    for key in 'abc':
+        cache.set(key, key.upper())
+    assert cache.get('a') == 'A'
+    cache.set('d', 'D')
+    assert cache.get('b') is None
+    assert [cache.get(key) for key in 'acd'] == ['A', 'C', 'D']
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    cache = LRUCache(jitter=0)
+    cache.set('short', 1, timeout=5)
+    cache.set('forever', 2, timeout=0)
+    now[0] += 6
+    assert cache.get('short') is None
+    assert not cache.has('short')
+    assert cache.get('forever') == 2
+    assert cache.stats()['expirations'] == 1
+
+
+def test_jitter_only_shortens_timeouts(monkeypatch):
+    monkeypatch.setattr(time, 'monotonic', lambda: 0.0)
+    cache = LRUCache(jitter=0.5)
+    for _ in range(100):
+        expires_at = cache._expires_at(100)
+        assert 50 <= expires_at <= 100
+
+
+def test_add_delete_and_stats():
+    cache = LRUCache(jitter=0)
+    assert cache.add('k', 1)
+    assert not cache.add('k', 2)
+    assert cache.get('k') == 1
+    assert cache.delete('k')
+    assert not cache.delete('k')
+    assert cache.get('k') is None
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_ratio']) == (1, 1, 0.5)
+
+
+def test_single_flight_runs_one_loader_for_concurrent_misses():
+    flight = SingleFlight(LRUCache(jitter=0))
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'value'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.get('key', loader))) for _ in range(5)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    # Let the followers queue up behind the running load before it finishes.
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ['value'] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {'loads': 1, 'coalesced': 4, 'in_flight': 0}
+
+
+def test_single_flight_does_not_cache_none():
+    flight = SingleFlight(LRUCache(jitter=0))
+    calls = []
+    assert flight.get('key', lambda: calls.append(1)) is None
+    assert flight.get('key', lambda: calls.append(1)) is None
+    assert len(calls) == 2
@@ -0,0 +1,92 @@
+import threading
+from collections import deque
+
+import pytest
+
+from id_allocator import IdNumberAllocator, IdNumbersExhausted
+
+
+class SharedStore:
+    """Stands in for the database tables every worker shares"""
+
+    def __init__(self):
+        self.high_water = 0
+        self.free = deque()
+        self.lock = threading.Lock()
+
+    def reserve(self, block_size):
+        with self.lock:
+            self.high_water += block_size
+            return self.high_water
+
+    def recycle(self, count):
+        with self.lock:
+            return [self.free.popleft() for _ in range(min(count, len(self.free)))]
+
+    def release(self, id_numbers):
+        with self.lock:
+            self.free.extend(id_numbers)
+
+    def allocator(self, block_size=10):
+        allocator = IdNumberAllocator(self.reserve, self.recycle, self.release, block_size=block_size)
+        allocator.load(self.high_water, [])
+        return allocator
+
+
+@pytest.fixture
+def small_space(monkeypatch):
+    # 46337 is coprime with 50, so the permutation still covers the whole space.
+    monkeypatch.setattr(IdNumberAllocator, 'SIZE', 50)
+
+
+def test_permutation_covers_the_whole_space():
+    allocator = IdNumberAllocator(None, None, None)
+    ids = {allocator.permute(n) for n in range(IdNumberAllocator.SIZE)}
+    assert len(ids) == IdNumberAllocator.SIZE
+    assert min(ids) == '10000' and max(ids) == '99999'
+
+
+def test_workers_never_share_an_id(small_space):
+    store = SharedStore()
+    workers = [store.allocator(), store.allocator()]
+    issued = []
+    # Alternate until both run dry; one may still be drawing on its last block when the other stops.
+    while workers:
+        for worker in list(workers):
+            try:
+                issued.append(worker.allocate())
+            except IdNumbersExhausted:
+                workers.remove(worker)
+    assert len(issued) == len(set(issued)) == IdNumberAllocator.SIZE
+
+
+def test_id_released_on_one_worker_is_reused_by_another(small_space):
+    store = SharedStore()
+    first, second = store.allocator(), store.allocator()
+    issued = first.allocate_many(IdNumberAllocator.SIZE)
+    first.release([issued[3]])
+    assert second.allocate() == issued[3]
+    with pytest.raises(IdNumbersExhausted):
+        first.allocate()
+
+
+def test_allocate_many_gives_back_a_partial_allocation(small_space):
+    store = SharedStore()
+    allocator = store.allocator()
+    issued = allocator.allocate_many(IdNumberAllocator.SIZE - 2)
+    with pytest.raises(IdNumbersExhausted):
+        allocator.allocate_many(5)
+    assert sorted(allocator.allocate_many(2)) == sorted(
+        set(map(allocator.permute, range(IdNumberAllocator.SIZE))) - set(issued)
+    )
+
+
+def test_ids_taken_before_load_are_skipped(small_space):
+    store = SharedStore()
+    probe = store.allocator()
+    legacy = [probe.permute(1), probe.permute(2)]
+    allocator = IdNumberAllocator(store.reserve, store.recycle, store.release, block_size=10)
+    allocator.load(0, legacy)
+    issued = allocator.allocate_many(IdNumberAllocator.SIZE - len(legacy))
+    assert not set(issued) & set(legacy)
+    assert len(set(issued)) == len(issued)
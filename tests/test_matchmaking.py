@@ -0,0 +1,84 @@
+import pytest
+
+from matchmaking import Matchmaker, SQLiteMatchmaker
+
+
+def player(user_id, socket_id=None):
+    return {'id': user_id, 'name': f'user {user_id}', 'socket_id': socket_id or f'sid-{user_id}'}
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def matchmaker(request, tmp_path):
+    if request.param == 'memory':
+        return Matchmaker()
+    return SQLiteMatchmaker(str(tmp_path / 'matchmaking.sqlite3'))
+
+
+def test_longest_waiting_player_is_matched_first(matchmaker):
+    matchmaker.enqueue(player('a'))
+    matchmaker.enqueue(player('b'))
+    assert matchmaker.pop_opponent('c')['id'] == 'a'
+    assert matchmaker.pop_opponent('c')['id'] == 'b'
+    assert matchmaker.pop_opponent('c') is None
+
+
+def test_player_is_not_matched_with_themselves(matchmaker):
+    matchmaker.enqueue(player('a'))
+    assert matchmaker.pop_opponent('a') is None
+    assert matchmaker.stats()['waiting'] == 1
+
+
+def test_cancel_and_requeue(matchmaker):
+    matchmaker.enqueue(player('a'))
+    matchmaker.enqueue(player('b'))
+    assert matchmaker.cancel('a')
+    assert not matchmaker.cancel('a')
+    matchmaker.enqueue(player('b', 'sid-new'))
+    opponent = matchmaker.pop_opponent('c')
+    assert opponent['id'] == 'b' and opponent['socket_id'] == 'sid-new'
+    assert matchmaker.pop_opponent('c') is None
+
+
+def test_disconnect_ends_games_and_drops_waiting_entry(matchmaker):
+    game_id, _ = matchmaker.create_game([player('a'), player('b')], is_bot=False)
+    bot_game_id, _ = matchmaker.create_game([player('a')], is_bot=True)
+    matchmaker.enqueue(player('a'))
+    assert sorted(matchmaker.disconnect('a', 'sid-a')) == sorted([game_id, bot_game_id])
+    assert matchmaker.get_game(game_id) is None
+    assert matchmaker.stats() == {'waiting': 0, 'games': 0, 'sockets': 0}
+
+
+def test_disconnect_of_an_old_socket_keeps_the_new_entry(matchmaker):
+    matchmaker.enqueue(player('a', 'sid-new'))
+    matchmaker.disconnect('a', 'sid-old')
+    assert matchmaker.pop_opponent('b')['socket_id'] == 'sid-new'
+
+
+def test_saved_game_changes_are_visible(matchmaker):
+    game_id, _ = matchmaker.create_game([player('a'), player('b')], is_bot=False)
+    game = matchmaker.get_game(game_id)
+    game['messages'].append({'sender': 'a', 'message': 'hi'})
+    game['last_sender'] = 'a'
+    matchmaker.save_game(game_id, game)
+    assert matchmaker.get_game(game_id)['last_sender'] == 'a'
+    assert matchmaker.end_game(game_id)['messages'] == [{'sender': 'a', 'message': 'hi'}]
+    assert matchmaker.end_game(game_id) is None
+
+
+def test_sweep_drops_idle_games_and_stale_waiting_players(matchmaker):
+    matchmaker.enqueue(player('a'))
+    matchmaker.create_game([player('b'), player('c')], is_bot=False)
+    matchmaker.waiting_timeout = matchmaker.idle_timeout = -1
+    matchmaker.sweep()
+    assert matchmaker.stats() == {'waiting': 0, 'games': 0, 'sockets': 0}
+
+
+def test_workers_sharing_a_file_match_each_other(tmp_path):
+    path = str(tmp_path / 'matchmaking.sqlite3')
+    first, second = SQLiteMatchmaker(path), SQLiteMatchmaker(path)
+    first.enqueue(player('a'))
+    assert second.pop_opponent('b')['id'] == 'a'
+    assert first.pop_opponent('c') is None
+    game_id, _ = second.create_game([player('a'), player('b')], is_bot=False)
+    assert first.disconnect('a', 'sid-a') == [game_id]
+    assert second.get_game(game_id) is None
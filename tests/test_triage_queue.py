@@ -0,0 +1,62 @@
+import random
+from datetime import datetime, timedelta
+
+from triage_queue import TriageQueue
+
+
+def expected_order(patients):
+    keys = sorted(TriageQueue.make_key(pid, level, when) for pid, (level, when) in patients.items())
+    return [(key[2], -key[0]) for key in keys]
+
+
+def test_matches_sorted_under_random_operations():
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1)
+    queue = TriageQueue()
+    patients = {}
+    for _ in range(3000):
+        patient_id = rng.randrange(200)
+        if patient_id in patients and rng.random() < 0.4:
+            assert queue.remove(patient_id)
+            del patients[patient_id]
+        else:
+            # Re-adding an id moves the patient, like a danger level change.
+            level = rng.randrange(1, 6)
+            when = start + timedelta(minutes=rng.randrange(60))
+            queue.add(patient_id, level, when)
+            patients[patient_id] = (level, when)
+
+        order = expected_order(patients)
+        assert len(queue) == len(patients)
+        if rng.random() < 0.1:
+            assert queue.ordered() == order
+            for position, (pid, _) in enumerate(order, start=1):
+                assert queue.position(pid) == position
+
+    assert queue.ordered() == expected_order(patients)
+
+
+def test_remove_and_position_of_unknown_patient():
+    queue = TriageQueue()
+    queue.add(1, 3, datetime(2024, 1, 1))
+    assert queue.position(2) is None
+    assert not queue.remove(2)
+    assert queue.remove(1)
+    assert len(queue) == 0
+    assert queue.ordered() == []
+
+
+def test_missing_level_and_time_sort_last_and_first():
+    queue = TriageQueue()
+    queue.add(1, None, datetime(2024, 1, 1))
+    queue.add(2, 2, datetime(2024, 1, 2))
+    queue.add(3, 2, None)
+    assert [pid for pid, _ in queue.ordered()] == [3, 2, 1]
+
+
+def test_rebuild_replaces_contents():
+    queue = TriageQueue()
+    queue.add(99, 5, datetime(2024, 1, 1))
+    queue.rebuild([(1, 1, datetime(2024, 1, 1)), (2, 4, datetime(2024, 1, 2))])
+    assert 99 not in queue
+    assert queue.ordered() == [(2, 4), (1, 1)]
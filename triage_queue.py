@@ -0,0 +1,138 @@
+import random
+import threading
+from datetime import datetime
+
+
+class _Node:
+    __slots__ = ('key', 'priority', 'size', 'left', 'right')
+
+    def __init__(self, key):
+        self.key = key
+        self.priority = random.random()
+        self.size = 1
+        self.left = None
+        self.right = None
+
+
+def _size(node):
+    return node.size if node else 0
+
+
+def _update(node):
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+
+def _split(node, key):
+    """Split a treap into (< key, >= key)"""
+    if node is None:
+        return None, None
+    if node.key < key:
+        left, right = _split(node.right, key)
+        node.right = left
+        _update(node)
+        return node, right
+    left, right = _split(node.left, key)
+    node.left = right
+    _update(node)
+    return left, node
+
+
+def _merge(left, right):
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+class TriageQueue:
+    """Order-statistic treap of waiting patients.
+
+    Patients are ordered by danger level (highest first), then by check-in
+    time, then by id so every key is unique. Insert, remove and rank are
+    all O(log n) expected.
+    """
+
+    def __init__(self):
+        self._root = None
+        self._keys = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def make_key(patient_id, danger_level, check_in_time):
+        return (-(danger_level or 0), check_in_time or datetime.min, patient_id)
+
+    def __len__(self):
+        return _size(self._root)
+
+    def __contains__(self, patient_id):
+        return patient_id in self._keys
+
+    def add(self, patient_id, danger_level, check_in_time):
+        key = self.make_key(patient_id, danger_level, check_in_time)
+        with self._lock:
+            if patient_id in self._keys:
+                self._remove_key(self._keys.pop(patient_id))
+            left, right = _split(self._root, key)
+            self._root = _merge(_merge(left, _Node(key)), right)
+            self._keys[patient_id] = key
+
+    def remove(self, patient_id):
+        with self._lock:
+            key = self._keys.pop(patient_id, None)
+            if key is None:
+                return False
+            self._remove_key(key)
+            return True
+
+    def _remove_key(self, key):
+        left, rest = _split(self._root, key)
+        _, right = _split(rest, (key[0], key[1], key[2] + 1))
+        self._root = _merge(left, right)
+
+    def position(self, patient_id):
+        """Return the 1-based queue position of a patient, or None"""
+        with self._lock:
+            key = self._keys.get(patient_id)
+            if key is None:
+                return None
+            rank = 0
+            node = self._root
+            while node is not None:
+                if key < node.key:
+                    node = node.left
+                elif node.key < key:
+                    rank += _size(node.left) + 1
+                    node = node.right
+                else:
+                    return rank + _size(node.left) + 1
+            return None
+
+    def ordered(self):
+        """Return the queue as a list of (patient_id, danger_level) in order"""
+        with self._lock:
+            result = []
+            stack = []
+            node = self._root
+            while stack or node is not None:
+                while node is not None:
+                    stack.append(node)
+                    node = node.left
+                node = stack.pop()
+                result.append((node.key[2], -node.key[0]))
+                node = node.right
+            return result
+
+    def rebuild(self, rows):
+        """Replace the queue contents from (id, danger_level, check_in_time) rows"""
+        with self._lock:
+            self._root = None
+            self._keys = {}
+            for patient_id, danger_level, check_in_time in rows:
+                self.add(patient_id, danger_level, check_in_time)
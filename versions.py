@@ -0,0 +1,91 @@
+import os
+import sqlite3
+import threading
+import uuid
+
+
+class VersionTable:
+    """Monotonic version counters for cached views.
+
+    Every write path bumps the keys it touches; readers build ETags from the
+    current counters. Bumps draw from one table-wide counter, so a key that
+    was forgotten and bumped again never repeats an earlier version. The
+    epoch changes on every start so ETags handed out by a previous process
+    can never match.
+    """
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._versions = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def bump(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._counter += 1
+                self._versions[key] = self._counter
+
+    def forget(self, *keys):
+        """Drop keys that will not be read again, such as those of discharged patients"""
+        with self._lock:
+            for key in keys:
+                self._versions.pop(key, None)
+
+    def get(self, key):
+        return self._versions.get(key, 0)
+
+    def etag(self, *keys):
+        return '-'.join([self.epoch] + [str(self.get(key)) for key in keys])
+
+
+class SQLiteVersionTable(VersionTable):
+    """Version table kept in a SQLite file shared by the workers on one machine.
+
+    Every worker reads the same counters and epoch, so cache keys built from
+    them hit the same entries in a shared cache backend and an ETag from one
+    worker is honoured by the others. The epoch is chosen by the first
+    worker to open the file.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(
+            'CREATE TABLE IF NOT EXISTS versions (key TEXT PRIMARY KEY, version INTEGER NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS version_meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);'
+        )
+        self._conn.executemany(
+            'INSERT OR IGNORE INTO version_meta (name, value) VALUES (?, ?)',
+            [('epoch', self.epoch), ('counter', '0')]
+        )
+        self.epoch = self._conn.execute("SELECT value FROM version_meta WHERE name = 'epoch'").fetchone()[0]
+
+    def bump(self, *keys):
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                for key in keys:
+                    self._conn.execute(
+                        "UPDATE version_meta SET value = CAST(value AS INTEGER) + 1 WHERE name = 'counter'"
+                    )
+                    self._conn.execute(
+                        'INSERT OR REPLACE INTO versions (key, version) '
+                        "SELECT ?, CAST(value AS INTEGER) FROM version_meta WHERE name = 'counter'",
+                        (key,)
+                    )
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+
+    def forget(self, *keys):
+        with self._lock:
+            self._conn.executemany('DELETE FROM versions WHERE key = ?', [(key,) for key in keys])
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute('SELECT version FROM versions WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else 0